@@ -0,0 +1,22 @@
+"""
+環境変数のブートストラップ
+
+.envの読み込みをプロセスで1回だけ行い、結果をos.environに反映する。
+Settings側はos.environを読むだけなので、init_dbとmigrate_jsonを
+同じコンテナ初期化で連続実行しても.envのパースは重複しない。
+"""
+from dotenv import load_dotenv
+
+_loaded = False
+
+
+def load_env() -> None:
+    """.envをos.environに読み込む（既存の環境変数は上書きしない）"""
+    global _loaded
+    if not _loaded:
+        load_dotenv(override=False)
+        _loaded = True
+
+
+# import時に1回だけ実行
+load_env()
@@ -2,8 +2,18 @@
 アプリケーション設定
 環境変数からデータベース接続情報などを読み込む
 """
+from functools import cached_property, lru_cache
+
 from pydantic_settings import BaseSettings
 
+import app.core.bootstrap  # noqa: F401  # .envをos.environへ1回だけ読み込む
+
+# 同期ドライバ用スキーム → 非同期ドライバ用スキームの変換表
+_SCHEME_MAP = {
+    "postgres://": "postgresql+asyncpg://",
+    "postgresql://": "postgresql+asyncpg://",
+}
+
 
 class Settings(BaseSettings):
     """アプリケーション設定"""
@@ -15,24 +25,43 @@ class Settings(BaseSettings):
     # アプリケーション設定
     APP_NAME: str = "TraceTree API"
     DEBUG: bool = False  # 本番環境ではFalse
+    # SQLログ出力はDEBUGとは独立に明示的なオプトインにする
+    # （ステートメント毎のフォーマット+ロガーI/Oはスループットを大きく削る）
+    SQL_ECHO: bool = False
     
     class Config:
-        env_file = ".env"  # .envファイルから自動読み込み
+        # .envはbootstrapがos.environへ読み込み済み（env_fileの再パース不要）
         case_sensitive = True
     
-    @property
+    @cached_property
     def async_database_url(self) -> str:
         """
-        DATABASE_URLを非同期ドライバ用に変換
+        DATABASE_URLを非同期ドライバ用に変換（初回アクセス時に1回だけ計算）
         postgres:// -> postgresql+asyncpg://
         """
         url = self.DATABASE_URL
-        if url.startswith("postgres://"):
-            url = url.replace("postgres://", "postgresql+asyncpg://", 1)
-        elif url.startswith("postgresql://"):
-            url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+        for prefix, replacement in _SCHEME_MAP.items():
+            if url.startswith(prefix):
+                return replacement + url[len(prefix):]
         return url
 
 
-# グローバル設定インスタンス
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    設定インスタンスを取得（プロセス内で1回だけ構築）
+
+    Settings()の構築は.envのパースと全環境変数のバリデーションを伴うため、
+    lru_cacheで初回アクセス時のみ実行する
+    """
+    return Settings()
+
+
+def __getattr__(name: str) -> Settings:
+    """
+    後方互換性のためのモジュール属性フック
+    `from app.core.config import settings` を初回アクセス時に遅延構築する
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,13 +5,25 @@ SQLAlchemy 2.0の非同期エンジンを使用
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
-from app.core.config import settings
+from app.core.config import get_settings
 
 # 非同期エンジンの作成
+_settings = get_settings()
 engine = create_async_engine(
-    settings.async_database_url,  # 非同期ドライバ用のURLを使用
-    echo=settings.DEBUG,  # SQLログを出力（開発時のみ）
+    _settings.async_database_url,  # 非同期ドライバ用のURLを使用
+    echo=_settings.SQL_ECHO,  # SQLログは明示的なオプトイン（DEBUGとは独立）
     future=True,
+    # コネクションプール設定（接続の張り直しによるTLS/認証コストを回避）
+    pool_size=20,
+    max_overflow=10,
+    pool_pre_ping=True,  # 切断済みコネクションを使う前に検出
+    pool_recycle=1800,  # 30分でコネクションを再作成
+    connect_args={
+        # プリペアドステートメントをキャッシュして同一SELECTの再パースを回避
+        "prepared_statement_cache_size": 1024,
+        # 短命クエリ中心のワークロードではJITのコンパイルコストが上回る
+        "server_settings": {"jit": "off"},
+    },
 )
 
 # セッションファクトリー
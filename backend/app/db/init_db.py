@@ -3,8 +3,12 @@
 テーブルを作成する
 """
 import asyncio
+
+import uvloop
+from sqlalchemy import text
+
 from app.core.database import engine, Base
-# from app.db.models import Tree  # モデルをインポート（テーブル定義を読み込むため）
+from app.db.models import Tree  # noqa: F401  # モデルをインポート（テーブル定義を読み込むため）
 
 
 async def init_db():
@@ -17,7 +21,27 @@ async def init_db():
         
         # 全てのテーブルを作成
         await conn.run_sync(Base.metadata.create_all)
-    
+
+        # 旧スキーマ（タイムスタンプをPython側のdefaultで埋めていた頃）で
+        # 作成済みのテーブルにはDEFAULTが無く、create_allは既存テーブルを
+        # 変更しないため、ここでサーバー側DEFAULTを付与する
+        # （マイグレーションのUPSERTはタイムスタンプ列を送らない）
+        await conn.execute(
+            text("ALTER TABLE trees ALTER COLUMN created_at SET DEFAULT now()")
+        )
+        await conn.execute(
+            text("ALTER TABLE trees ALTER COLUMN updated_at SET DEFAULT now()")
+        )
+
+        # GINインデックスも同様に既存テーブルには作成されないため、
+        # ここで冪等に作成する（新規作成時はcreate_allが作成済みでno-op）
+        await conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_trees_nodes_gin "
+                "ON trees USING gin (nodes jsonb_path_ops)"
+            )
+        )
+
     print("データベースの初期化が完了しました")
     print(f"テーブル作成: {', '.join([table.name for table in Base.metadata.sorted_tables])}")
 
@@ -30,4 +54,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    uvloop.install()  # libuvベースのイベントループで実行
     asyncio.run(main())
@@ -2,65 +2,116 @@
 JSONファイルからデータベースへのマイグレーションスクリプト
 """
 import asyncio
-import json
 from pathlib import Path
-from sqlalchemy import select
+from typing import Dict, List, Optional
+
+import aiofiles
+import msgspec
+import orjson
+import uvloop
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 
 from app.core.database import AsyncSessionLocal
 from app.db.models import Tree as TreeModel
 
 
+# 書き込み時スキーマ検証用のmsgspec Struct定義
+# （APIは読み取り時に再検証しないため、ここが唯一の検証ポイント。
+# app/models/tree.pyのPydanticスキーマと対になる — 変更時は両方更新すること）
+class OptionMsg(msgspec.Struct):
+    id: str
+    label: str
+    next_node_ids: Optional[List[str]] = None
+
+
+class HintMsg(msgspec.Struct):
+    text: str
+    type: str
+
+
+class NodeMsg(msgspec.Struct):
+    id: str
+    question: str
+    type: str
+    options: List[OptionMsg]
+    hint: Optional[str] = None
+    hint_type: Optional[str] = None
+    hints: Optional[List[HintMsg]] = None
+    description: Optional[str] = None
+
+
+class TreeMsg(msgspec.Struct):
+    id: str
+    title: str
+    description: str
+    root_node_id: str
+    nodes: Dict[str, NodeMsg]
+
+
+async def _load_tree(json_file: Path) -> dict:
+    """JSONファイルを非同期に読み込み、スキーマ検証してパースする"""
+    async with aiofiles.open(json_file, "rb") as f:
+        data = await f.read()
+    # 型付きデコードで形式を検証（不正なファイルはここで弾く）
+    # 保存するのは元のJSONそのままの辞書（Structのデフォルト値を混ぜない）
+    msgspec.json.decode(data, type=TreeMsg)
+    return orjson.loads(data)
+
+
 async def migrate_json_to_db():
     """
     JSONファイルからデータベースにツリーデータをインポート
+
+    全ファイルを1つのINSERT ... ON CONFLICT DO UPDATEにまとめて
+    1回のexecute + 1回のcommitで保存する（ファイル毎の往復を排除）
     """
     # JSONファイルのパス
     json_dir = Path("app/data/trees")
     json_files = list(json_dir.glob("*.json"))
-    
+
     if not json_files:
         print("JSONファイルが見つかりません")
         return
-    
+
     print(f"{len(json_files)}個のJSONファイルを発見しました")
-    
+
+    # JSONファイルを並行して読み込み（ディスクI/OをDB往復と重ねられる）
+    trees = await asyncio.gather(*(_load_tree(f) for f in json_files))
+    rows = [
+        {
+            "id": tree_data["id"],
+            "title": tree_data["title"],
+            "description": tree_data["description"],
+            "root_node_id": tree_data["root_node_id"],
+            "nodes": tree_data["nodes"],
+        }
+        for tree_data in trees
+    ]
+
+    # 1回のUPSERTで全件を保存（既存IDは更新、新規IDは挿入）
+    # ORMのunit-of-workを介さずCore文として実行し、行毎の
+    # identity-map管理やflush時の属性検査を省く
+    stmt = insert(TreeModel.__table__).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={
+            "title": stmt.excluded.title,
+            "description": stmt.excluded.description,
+            "root_node_id": stmt.excluded.root_node_id,
+            "nodes": stmt.excluded.nodes,
+            "updated_at": func.now(),
+        },
+    ).returning(TreeModel.__table__.c.id, TreeModel.__table__.c.title)
+
     async with AsyncSessionLocal() as session:
-        for json_file in json_files:
-            print(f"\n処理中: {json_file.name}")
-            
-            # JSONファイルを読み込み
-            with open(json_file, "r", encoding="utf-8") as f:
-                tree_data = json.load(f)
-            
-            # 既存のレコードを確認
-            result = await session.execute(
-                select(TreeModel).where(TreeModel.id == tree_data["id"])
-            )
-            existing_tree = result.scalar_one_or_none()
-            
-            if existing_tree:
-                print(f"  既に存在します: {tree_data['id']}")
-                print("  更新します...")
-                existing_tree.title = tree_data["title"]
-                existing_tree.description = tree_data["description"]
-                existing_tree.root_node_id = tree_data["root_node_id"]
-                existing_tree.nodes = tree_data["nodes"]
-            else:
-                # 新規作成
-                new_tree = TreeModel(
-                    id=tree_data["id"],
-                    title=tree_data["title"],
-                    description=tree_data["description"],
-                    root_node_id=tree_data["root_node_id"],
-                    nodes=tree_data["nodes"]
-                )
-                session.add(new_tree)
-                print(f"  新規作成: {tree_data['id']}")
-            
-            # コミット
-            await session.commit()
-            print(f"  保存完了: {tree_data['title']}")
-    
+        result = await session.execute(stmt)
+        saved = result.all()
+        await session.commit()
+
+    for tree_id, title in saved:
+        print(f"  保存完了: {title} ({tree_id})")
+
     print("\n全てのJSONファイルのマイグレーションが完了しました！")
 
 
@@ -73,4 +124,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    uvloop.install()  # libuvベースのイベントループで実行
     asyncio.run(main())
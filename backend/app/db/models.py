@@ -1,8 +1,7 @@
 """
 SQLAlchemyモデル定義
 """
-from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy import Column, Index, String, DateTime, Text, func
 from sqlalchemy.dialects.postgresql import JSONB
 
 from app.core.database import Base
@@ -15,7 +14,17 @@ class Tree(Base):
     JSONファイルの構造をそのままJSONB列に保存
     """
     __tablename__ = "trees"
-    
+    __table_args__ = (
+        # nodes内の包含検索（@>）用GINインデックス
+        # jsonb_path_opsは既定のopsより小さく、包含クエリに速い
+        Index(
+            "ix_trees_nodes_gin",
+            "nodes",
+            postgresql_using="gin",
+            postgresql_ops={"nodes": "jsonb_path_ops"},
+        ),
+    )
+
     # プライマリーキー
     id = Column(String, primary_key=True, index=True)
     
@@ -27,9 +36,17 @@ class Tree(Base):
     # ノードデータ（JSON構造をそのまま保存）
     nodes = Column(JSONB, nullable=False)
     
-    # タイムスタンプ
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # タイムスタンプ（Postgres側のnow()で埋める — Python側でのdatetime生成と
+    # 行毎のパラメータ送信を省く）
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
     
     def __repr__(self):
         return f"<Tree(id={self.id}, title={self.title})>"
@@ -1,30 +1,79 @@
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.models.tree import Tree as TreeSchema
 from app.routers import trees
 
-app = FastAPI(
-    title="TraceTree API",
-    description="HTB攻略ツリー管理API",
-    version="0.1.0"
-)
-
-# CORS設定（フロントエンドからのアクセスを許可）
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",     # ローカル開発
-        "http://localhost:5174",     # ローカル開発（代替ポート）
-        "https://tracetree.vercel.app",  # 本番フロントエンド
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# ルーター登録
-app.include_router(trees.router)
-
-@app.get("/")
-async def root():
-    """ヘルスチェック用エンドポイント"""
-    return {"message": "TraceTree API is running"}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    起動時ウォームアップ
+
+    初回リクエストに接続確立（TLS/認証）やPydanticのコアスキーマ構築の
+    コストを払わせないよう、起動時に前倒しで実行する
+    """
+    # Pydanticのコアスキーマを起動時に構築
+    TreeSchema.model_rebuild()
+
+    # コネクションを1本張ってプールを温める
+    async with engine.begin() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    yield
+
+
+@lru_cache(maxsize=1)
+def create_app() -> FastAPI:
+    """
+    アプリケーションファクトリ
+
+    lru_cacheで1回だけ構築し、ホットリロード等でモジュールが
+    再評価されてもミドルウェアやルートが重複登録されないようにする
+    """
+    app = FastAPI(
+        title="TraceTree API",
+        description="HTB攻略ツリー管理API",
+        version="0.1.0",
+        default_response_class=ORJSONResponse,  # orjsonで高速にシリアライズ
+        lifespan=lifespan,
+    )
+
+    # CORS設定（フロントエンドからのアクセスを許可）
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://localhost:5173",     # ローカル開発
+            "http://localhost:5174",     # ローカル開発（代替ポート）
+        ],
+        # Vercel上のフロントエンド（本番 + プレビュー）
+        # ^...$でアンカーし、文字クラスを限定してバックトラッキングを防ぐ
+        allow_origin_regex=r"^https://[A-Za-z0-9-]+\.vercel\.app$",
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # レスポンス圧縮（ネストしたnodes辞書のJSONは圧縮が非常によく効く）
+    # 512バイト未満の小さなレスポンスは圧縮コストの方が高いのでスキップ
+    app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
+    # ルーター登録
+    app.include_router(trees.router)
+
+    @app.get("/")
+    async def root():
+        """ヘルスチェック用エンドポイント"""
+        return {"message": "TraceTree API is running"}
+
+    return app
+
+
+app = create_app()
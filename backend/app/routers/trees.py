@@ -1,6 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
+import hashlib
+from typing import Optional
+
+from cachetools import TTLCache
+from fastapi import APIRouter, Header, HTTPException, Depends, Path
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Text, select, func
 
 from app.models.tree import Tree as TreeSchema
 from app.db.models import Tree as TreeModel
@@ -8,33 +13,77 @@ from app.core.database import get_db
 
 router = APIRouter(prefix="/api/trees", tags=["trees"])
 
+# ツリーは読み取り中心でデプロイ単位でほぼ不変のため、
+# シリアライズ済みレスポンスのバイト列とETagをプロセス内に
+# TTL付きでキャッシュする（値は (body, etag) のタプル。
+# 書き込みエンドポイントを追加する場合はここを無効化すること）
+_tree_cache: TTLCache = TTLCache(maxsize=128, ttl=300)
+
+
+def _make_etag(body: bytes) -> str:
+    """レスポンスボディの内容ハッシュからETagを生成する"""
+    # blake2bはSHA-NI非搭載のCPUでもsha256より速い
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _tree_response(body: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+    """ETagが一致すればボディなしの304、それ以外は200でボディを返す"""
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
-@router.get("/{tree_id}", response_model=TreeSchema)
-async def get_tree(tree_id: str, db: AsyncSession = Depends(get_db)):
+@router.get("/{tree_id}", responses={200: {"model": TreeSchema}})
+async def get_tree(
+    # IDの形式（小文字英数字とハイフン）に合わないURLはルーター段階で
+    # 422として弾き、DBセッションの取得とSQL往復を発生させない
+    tree_id: str = Path(..., pattern=r"^[a-z0-9][a-z0-9\-]{0,63}$"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
     """
     指定されたツリーの全データを取得
-    
+
     Args:
         tree_id: ツリーID（例: "nmap-basics-linux"）
+        if_none_match: クライアントが保持するETag（条件付きGET用）
         db: データベースセッション（依存性注入）
-    
+
     Returns:
-        Tree: ツリーデータ（Pydanticモデル）
-    
+        Response: ツリーデータのJSON（スキーマはTreeSchema）
+
     Raises:
         HTTPException: ツリーが見つからない場合（404）
     """
-    # データベースからツリーを取得
+    # キャッシュ済みならDBアクセスもシリアライズも省略
+    # （If-None-MatchがETagと一致すればボディ転送も省略して304）
+    cached = _tree_cache.get(tree_id)
+    if cached is not None:
+        return _tree_response(*cached, if_none_match)
+
+    # レスポンスのJSONをPostgres側で組み立ててテキストとして取得する
+    # nodesのJSONBはDB上で既に有効なJSONなので、Pythonでの
+    # デコード→dict→再エンコードを丸ごと省略できる
+    # （レスポンスに使う列だけをSELECTするのでORM構築も発生しない。
+    # TreeSchemaはOpenAPIドキュメント用にresponsesで宣言）
     result = await db.execute(
-        select(TreeModel).where(TreeModel.id == tree_id)
+        select(
+            func.jsonb_build_object(
+                "id", TreeModel.id,
+                "title", TreeModel.title,
+                "description", TreeModel.description,
+                "root_node_id", TreeModel.root_node_id,
+                "nodes", TreeModel.nodes,
+            ).cast(Text)
+        ).where(TreeModel.id == tree_id)
     )
-    tree_model = result.scalar_one_or_none()
-    
-    if not tree_model:
+    payload = result.scalar_one_or_none()
+
+    if payload is None:
         raise HTTPException(status_code=404, detail=f"Tree not found: {tree_id}")
-    
-    # SQLAlchemyモデル → Pydanticモデルに変換
-    tree_dict = tree_model.to_dict()
-    tree_schema = TreeSchema(**tree_dict)
-    
-    return tree_schema
+
+    body = payload.encode()
+    etag = _make_etag(body)
+    _tree_cache[tree_id] = (body, etag)
+    return _tree_response(body, etag, if_none_match)
@@ -12,4 +12,5 @@ python -m app.db.migrate_json
 
 # アプリケーションの起動
 echo "Starting Uvicorn..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
+# uvloop + httptools でイベントループとHTTPパースを高速化
+exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools
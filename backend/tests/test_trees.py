@@ -1,4 +1,5 @@
 """Tree API endpoints test (DB access is mocked)."""
+import json
 import os
 
 os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://u:p@localhost:5432/test")
@@ -7,30 +8,25 @@ from fastapi.testclient import TestClient
 
 from app.core.database import get_db
 from app.main import app
+from app.routers.trees import _tree_cache
 
 
 class FakeResult:
-    def __init__(self, tree_model):
-        self._tree_model = tree_model
-
-    def scalar_one_or_none(self):
-        return self._tree_model
+    """jsonb_build_object(...)::text のSELECT結果を模倣する"""
 
+    def __init__(self, payload):
+        self._payload = payload
 
-class FakeTreeModel:
-    def __init__(self, data):
-        self._data = data
-
-    def to_dict(self):
-        return self._data
+    def scalar_one_or_none(self):
+        return self._payload
 
 
 class FakeSession:
-    def __init__(self, tree_model):
-        self._tree_model = tree_model
+    def __init__(self, payload):
+        self._payload = payload
 
     async def execute(self, _query):
-        return FakeResult(self._tree_model)
+        return FakeResult(self._payload)
 
 
 TREE_FIXTURE = {
@@ -51,7 +47,7 @@ TREE_FIXTURE = {
 
 def test_get_tree_success():
     async def override_get_db():
-        yield FakeSession(FakeTreeModel(TREE_FIXTURE))
+        yield FakeSession(json.dumps(TREE_FIXTURE))
 
     app.dependency_overrides[get_db] = override_get_db
     client = TestClient(app)
@@ -66,6 +62,30 @@ def test_get_tree_success():
         assert "linux-root" in body["nodes"]
     finally:
         app.dependency_overrides.clear()
+        _tree_cache.clear()
+
+
+def test_get_tree_etag_returns_304():
+    async def override_get_db():
+        yield FakeSession(json.dumps(TREE_FIXTURE))
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    try:
+        first = client.get("/api/trees/nmap-basics-linux")
+        etag = first.headers["etag"]
+
+        second = client.get(
+            "/api/trees/nmap-basics-linux", headers={"If-None-Match": etag}
+        )
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+    finally:
+        app.dependency_overrides.clear()
+        _tree_cache.clear()
 
 
 def test_get_tree_not_found():
@@ -82,3 +102,4 @@ def test_get_tree_not_found():
         assert response.json()["detail"] == "Tree not found: unknown-tree"
     finally:
         app.dependency_overrides.clear()
+        _tree_cache.clear()